@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from openpyxl import Workbook, load_workbook
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+for tool_dir in ("sample-app", "merge-two-excels", "export-to-pdf"):
+    sys.path.insert(0, str(REPO_ROOT / tool_dir))
+
+import make_portable_zip  # noqa: E402
+from data_gen import generate_rows  # noqa: E402
+from excel_export import export_to_xlsx  # noqa: E402
+from excel_to_pdf_lo import prepare_temp_workbook, resolve_soffice, run_soffice  # noqa: E402
+from merge_excel import copy_values_and_formats, get_used_range  # noqa: E402
+
+
+SCALE_PRESETS = {
+    "small": (1_000, 10, 1),
+    "medium": (10_000, 20, 2),
+    "large": (50_000, 30, 3),
+}
+DEFAULT_STAGES = [
+    "generate_rows",
+    "export_to_xlsx",
+    "merge_load",
+    "merge_copy",
+    "prepare_temp_workbook",
+    "make_portable_zip",
+    "soffice",
+]
+
+
+def parse_scale(value: str) -> tuple[int, int, int]:
+    if value in SCALE_PRESETS:
+        return SCALE_PRESETS[value]
+    try:
+        rows, cols, sheets = (int(part) for part in value.lower().split("x"))
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(
+            f"invalid scale (expected {', '.join(SCALE_PRESETS)} or ROWSxCOLSxSHEETS): {value}"
+        ) from exc
+    if rows <= 0 or cols <= 0 or sheets <= 0:
+        raise argparse.ArgumentTypeError(f"scale values must be positive: {value}")
+    return rows, cols, sheets
+
+
+def format_scale(scale: tuple[int, int, int]) -> str:
+    return "x".join(str(part) for part in scale)
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the data generation, export, merge, PDF and zip tools."
+    )
+    parser.add_argument(
+        "--scale",
+        action="append",
+        type=parse_scale,
+        default=[],
+        help="small, medium, large or ROWSxCOLSxSHEETS (can be repeated; default: small, medium)",
+    )
+    parser.add_argument(
+        "--stage",
+        action="append",
+        choices=DEFAULT_STAGES,
+        default=[],
+        help="Stage to run (can be repeated; default: all)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Timed runs per stage; the fastest is reported (default: 3)",
+    )
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Skip the extra tracemalloc run that measures peak memory",
+    )
+    parser.add_argument(
+        "--soffice",
+        help="Path to soffice binary (auto-detect; the soffice stage is skipped if not found)",
+    )
+    parser.add_argument(
+        "--output",
+        help="Write results as JSON to this path",
+    )
+    parser.add_argument(
+        "--compare",
+        help="Baseline JSON to compare against; exits with 1 on regressions",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="Relative slowdown or memory growth flagged as a regression (default: 0.15)",
+    )
+    return parser.parse_args(argv)
+
+
+def synthesize_workbook(path: Path, rows: int, cols: int, sheets: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    wb = Workbook(write_only=True)
+    for sheet_idx in range(sheets):
+        ws = wb.create_sheet("data" if sheet_idx == 0 else f"Sheet{sheet_idx + 1}")
+        ws.append([f"Col{c}" for c in range(1, cols + 1)])
+        for r in range(rows):
+            row = []
+            for c in range(cols):
+                kind = c % 3
+                if kind == 0:
+                    row.append(r)
+                elif kind == 1:
+                    row.append(round(rng.uniform(0, 10_000), 2))
+                else:
+                    row.append(f"text-{rng.randrange(10_000)}")
+            ws.append(row)
+    wb.save(path)
+
+
+def synthesize_tree(root: Path, workbook: Path, rows: int) -> None:
+    (root / "src").mkdir(parents=True)
+    for idx in range(max(1, rows // 1_000)):
+        text = "".join(f"line {idx} {n} some repeated content\n" for n in range(500))
+        (root / "src" / f"module_{idx}.py").write_text(text)
+    (root / "data.xlsx").write_bytes(workbook.read_bytes())
+    venv_dir = root / ".venv" / "lib"
+    venv_dir.mkdir(parents=True)
+    for idx in range(200):
+        (venv_dir / f"pkg_{idx}.py").write_text("x = 1\n")
+
+
+class StageContext:
+    def __init__(self, workdir: Path, scale: tuple[int, int, int], soffice_path):
+        self.workdir = workdir
+        self.scale = scale
+        self.soffice_path = soffice_path
+        self._data_path = None
+
+    @property
+    def data_path(self) -> Path:
+        if self._data_path is None:
+            rows, cols, sheets = self.scale
+            self._data_path = self.workdir / "data.xlsx"
+            synthesize_workbook(self._data_path, rows, cols, sheets)
+        return self._data_path
+
+
+# Each setup function prepares its inputs outside the measurement and returns
+# the callable that is timed, or a (prepare, run) pair when every run needs
+# fresh state: prepare() is called untimed before each run and its result is
+# passed to run().
+def setup_generate_rows(ctx: StageContext):
+    rows = ctx.scale[0]
+    date_from = datetime(2024, 1, 1)
+    date_to = datetime(2024, 12, 31, 23, 59, 59)
+    return lambda: generate_rows(rows, date_from, date_to, "Sales", 0.0, random.Random(0))
+
+
+def setup_export_to_xlsx(ctx: StageContext):
+    rows = generate_rows(
+        ctx.scale[0], datetime(2024, 1, 1), datetime(2024, 12, 31), "Sales", 0.0, random.Random(0)
+    )
+    path = ctx.workdir / "export_raw.xlsx"
+    return lambda: export_to_xlsx(str(path), rows)
+
+
+def setup_merge_load(ctx: StageContext):
+    path = ctx.data_path
+    return lambda: load_workbook(path, data_only=False)
+
+
+def setup_merge_copy(ctx: StageContext):
+    source_ws = load_workbook(ctx.data_path).worksheets[0]
+    max_row, max_col = get_used_range(source_ws)
+    # A reused target would only measure overwriting cells created by the first run.
+    return (
+        lambda: Workbook().active,
+        lambda target_ws: copy_values_and_formats(source_ws, target_ws, max_row, max_col),
+    )
+
+
+def setup_prepare_temp_workbook(ctx: StageContext):
+    temp_dir = ctx.workdir / "prepare"
+    temp_dir.mkdir(exist_ok=True)
+    path = ctx.data_path
+    return lambda: prepare_temp_workbook(path, 0, temp_dir)
+
+
+def setup_make_portable_zip(ctx: StageContext):
+    tree = ctx.workdir / "tree"
+    if not tree.exists():
+        synthesize_tree(tree, ctx.data_path, ctx.scale[0])
+    output = ctx.workdir / "portable.zip"
+    jobs = os.cpu_count() or 1
+
+    def run():
+        files = make_portable_zip.collect_files(tree, make_portable_zip.DEFAULT_EXCLUDE_GLOBS)
+        make_portable_zip.write_zip(output, files, 9, jobs)
+
+    return run
+
+
+def setup_soffice(ctx: StageContext):
+    if not ctx.soffice_path:
+        return None
+    temp_dir = ctx.workdir / "soffice"
+    temp_dir.mkdir(exist_ok=True)
+    temp_xlsx = prepare_temp_workbook(ctx.data_path, 0, temp_dir)
+    out_dir = temp_dir / "out"
+    out_dir.mkdir(exist_ok=True)
+
+    def run():
+        code, _, stderr = run_soffice(ctx.soffice_path, temp_xlsx, out_dir, 600)
+        if code != 0:
+            raise RuntimeError(f"soffice exited with code {code}: {stderr.strip()}")
+
+    return run
+
+
+STAGE_SETUPS = {
+    "generate_rows": setup_generate_rows,
+    "export_to_xlsx": setup_export_to_xlsx,
+    "merge_load": setup_merge_load,
+    "merge_copy": setup_merge_copy,
+    "prepare_temp_workbook": setup_prepare_temp_workbook,
+    "make_portable_zip": setup_make_portable_zip,
+    "soffice": setup_soffice,
+}
+
+
+def measure(fn, repeat: int, with_memory: bool, prepare=None) -> tuple[float, int | None]:
+    def call():
+        if prepare is None:
+            return fn
+        state = prepare()
+        return lambda: fn(state)
+
+    best = float("inf")
+    for _ in range(repeat):
+        run = call()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if with_memory:
+        run = call()
+        tracemalloc.start()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return best, peak
+
+
+def run_benchmarks(args: argparse.Namespace) -> list[dict]:
+    scales = args.scale or [SCALE_PRESETS["small"], SCALE_PRESETS["medium"]]
+    stages = args.stage or DEFAULT_STAGES
+    soffice_path = resolve_soffice(args.soffice) if "soffice" in stages else None
+    results = []
+
+    for scale in scales:
+        with tempfile.TemporaryDirectory(prefix="bench_") as temp_dir:
+            ctx = StageContext(Path(temp_dir), scale, soffice_path)
+            for stage in stages:
+                fn = STAGE_SETUPS[stage](ctx)
+                if fn is None:
+                    print(f"  {stage:<24} {format_scale(scale):>14}  skipped (soffice not found)")
+                    continue
+                prepare, fn = fn if isinstance(fn, tuple) else (None, fn)
+                wall, peak = measure(fn, args.repeat, not args.no_memory, prepare)
+                results.append(
+                    {
+                        "stage": stage,
+                        "scale": format_scale(scale),
+                        "wall_seconds": round(wall, 6),
+                        "peak_bytes": peak,
+                    }
+                )
+                peak_text = "-" if peak is None else f"{peak / (1024 * 1024):.1f} MiB"
+                print(f"  {stage:<24} {format_scale(scale):>14}  {wall:9.3f} s  {peak_text:>12}")
+
+    return results
+
+
+def compare_results(results: list[dict], baseline: dict, threshold: float) -> list[str]:
+    previous = {(item["stage"], item["scale"]): item for item in baseline.get("results", [])}
+    regressions = []
+    for item in results:
+        base = previous.get((item["stage"], item["scale"]))
+        if base is None:
+            continue
+        for key, label in (("wall_seconds", "time"), ("peak_bytes", "memory")):
+            current, before = item.get(key), base.get(key)
+            if not current or not before:
+                continue
+            change = current / before - 1
+            if change > threshold:
+                regressions.append(
+                    f"{item['stage']} @ {item['scale']}: {label} {before} -> {current} (+{change:.0%})"
+                )
+    return regressions
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    if args.repeat <= 0:
+        print("Error: --repeat must be positive", file=sys.stderr)
+        return 2
+
+    baseline = None
+    if args.compare:
+        try:
+            baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            print(f"Error: failed to read baseline: {exc}", file=sys.stderr)
+            return 2
+
+    print(f"  {'stage':<24} {'scale':>14}  {'wall':>11}  {'peak':>12}")
+    results = run_benchmarks(args)
+
+    if args.output:
+        report = {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Results: {output_path}")
+
+    if baseline is not None:
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print("Regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("No regressions against baseline.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
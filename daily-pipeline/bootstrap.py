@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import venv
+
+
+STAMP_NAME = ".requirements-stamp"
+
+
+def venv_python_path(venv_dir: str) -> str:
+    if os.name == "nt":
+        return os.path.join(venv_dir, "Scripts", "python.exe")
+    return os.path.join(venv_dir, "bin", "python")
+
+
+def ensure_venv(venv_dir: str) -> None:
+    if os.path.isdir(venv_dir):
+        return
+    builder = venv.EnvBuilder(with_pip=True, clear=False)
+    builder.create(venv_dir)
+
+
+def venv_python_version(venv_dir: str) -> str:
+    try:
+        with open(os.path.join(venv_dir, "pyvenv.cfg"), encoding="utf-8") as fh:
+            for line in fh:
+                key, _, value = line.partition("=")
+                if key.strip() in ("version", "version_info"):
+                    return value.strip()
+    except OSError:
+        pass
+    return ""
+
+
+def resolve_wheelhouse(project_dir: str) -> str:
+    wheelhouse = os.environ.get("BOOTSTRAP_WHEELHOUSE") or os.path.join(project_dir, "wheelhouse")
+    return wheelhouse if os.path.isdir(wheelhouse) else ""
+
+
+def requirements_stamp(requirements: str, venv_dir: str, wheelhouse: str) -> dict:
+    with open(requirements, "rb") as fh:
+        digest = hashlib.sha256(fh.read()).hexdigest()
+    return {
+        "requirements_sha256": digest,
+        "python": venv_python_version(venv_dir),
+        "wheelhouse": wheelhouse,
+    }
+
+
+def read_stamp(venv_dir: str) -> dict:
+    try:
+        with open(os.path.join(venv_dir, STAMP_NAME), encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_stamp(venv_dir: str, stamp: dict) -> None:
+    with open(os.path.join(venv_dir, STAMP_NAME), "w", encoding="utf-8") as fh:
+        json.dump(stamp, fh)
+
+
+def ensure_requirements(python_exe: str, project_dir: str, venv_dir: str) -> None:
+    requirements = os.path.join(project_dir, "requirements.txt")
+    wheelhouse = resolve_wheelhouse(project_dir)
+    stamp = requirements_stamp(requirements, venv_dir, wheelhouse)
+    if read_stamp(venv_dir) == stamp:
+        return
+
+    command = [python_exe, "-m", "pip", "install", "-r", requirements]
+    if wheelhouse:
+        command += ["--no-index", "--find-links", wheelhouse]
+    subprocess.check_call(command)
+    write_stamp(venv_dir, stamp)
+
+
+def run() -> int:
+    project_dir = os.path.dirname(os.path.abspath(__file__))
+    venv_dir = os.path.join(project_dir, ".venv")
+    ensure_venv(venv_dir)
+    python_exe = venv_python_path(venv_dir)
+
+    ensure_requirements(python_exe, project_dir, venv_dir)
+    return subprocess.call([python_exe, os.path.join(project_dir, "app.py"), *sys.argv[1:]])
+
+
+if __name__ == "__main__":
+    raise SystemExit(run())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+import argparse
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from openpyxl import load_workbook
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+for tool_dir in ("sample-app", "merge-two-excels", "export-to-pdf"):
+    sys.path.insert(0, str(REPO_ROOT / tool_dir))
+
+from batch_gen import parse_date  # noqa: E402
+from data_gen import generate_rows  # noqa: E402
+from excel_export import build_workbook  # noqa: E402
+from excel_to_pdf_lo import ConversionError, export_workbook_to_pdf, resolve_soffice  # noqa: E402
+from merge_excel import find_sheet_case_insensitive, merge_into_template  # noqa: E402
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    parser = argparse.ArgumentParser(
+        description="Generate data, merge it into the template and export a PDF in one process."
+    )
+    parser.add_argument("--rows", type=int, default=50, help="Rows to generate (default: 50)")
+    parser.add_argument(
+        "--category",
+        default="Sales",
+        help="Category to generate (default: Sales)",
+    )
+    parser.add_argument(
+        "--date-from",
+        type=parse_date,
+        default=today - timedelta(days=7),
+        help="Start date YYYY-MM-DD (default: 7 days ago)",
+    )
+    parser.add_argument(
+        "--date-to",
+        type=parse_date,
+        default=today,
+        help="End date YYYY-MM-DD (default: today)",
+    )
+    parser.add_argument("--min-amount", type=float, default=0.0, help="Minimum amount (default: 0.0)")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed (default: random)")
+    parser.add_argument(
+        "--template",
+        default=str(REPO_ROOT / "template.xlsx"),
+        help="Path to template .xlsx (default: ../template.xlsx)",
+    )
+    parser.add_argument("--sheet", default="data", help="Target sheet name in template (default: data)")
+    parser.add_argument(
+        "--copy-styles",
+        action="store_true",
+        help="Copy full cell styles, column widths and row heights from the generated sheet",
+    )
+    parser.add_argument(
+        "--outdir",
+        default=str(REPO_ROOT / "out"),
+        help="Output directory (default: ../out)",
+    )
+    parser.add_argument("--prefix", default="", help="Output filename prefix (default: empty)")
+    parser.add_argument("--save-raw", action="store_true", help="Also write the generated raw .xlsx")
+    parser.add_argument("--save-xlsx", action="store_true", help="Also write the merged .xlsx")
+    parser.add_argument("--skip-pdf", action="store_true", help="Stop after the merge step")
+    parser.add_argument("--soffice", help="Path to soffice binary (auto-detect if omitted)")
+    parser.add_argument("--sheet-index", type=int, default=0, help="Sheet index to export (default: 0)")
+    parser.add_argument(
+        "--timeout-seconds",
+        type=int,
+        default=60,
+        help="Conversion timeout in seconds (default: 60)",
+    )
+    return parser.parse_args(argv)
+
+
+def build_output_stem(prefix: str) -> str:
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    return f"{prefix}_{timestamp}" if prefix else timestamp
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+
+    if args.rows <= 0:
+        print("Error: --rows must be positive", file=sys.stderr)
+        return 2
+
+    soffice_path = None
+    if not args.skip_pdf:
+        soffice_path = resolve_soffice(args.soffice)
+        if not soffice_path:
+            print(
+                "Error: LibreOffice (soffice) not found. Install LibreOffice, "
+                "provide the path via --soffice, or pass --skip-pdf.",
+                file=sys.stderr,
+            )
+            return 3
+
+    rng = random.Random(args.seed)
+    date_to = args.date_to.replace(hour=23, minute=59, second=59)
+    rows = generate_rows(args.rows, args.date_from, date_to, args.category, args.min_amount, rng)
+    data_wb = build_workbook(rows)
+
+    outdir = Path(args.outdir)
+    stem = build_output_stem(args.prefix)
+    try:
+        outdir.mkdir(parents=True, exist_ok=True)
+    except OSError as exc:
+        print(f"Error: failed to create output directory: {exc}", file=sys.stderr)
+        return 4
+
+    raw_path = outdir / f"{stem}_raw.xlsx"
+    if args.save_raw:
+        try:
+            data_wb.save(raw_path)
+        except Exception as exc:
+            print(f"Error: failed to save raw workbook: {exc}", file=sys.stderr)
+            return 1
+
+    try:
+        template_wb = load_workbook(args.template)
+    except Exception as exc:
+        print(f"Error: failed to open template workbook: {exc}", file=sys.stderr)
+        return 1
+
+    target_ws = find_sheet_case_insensitive(template_wb, args.sheet)
+    if target_ws is None:
+        print(f"Error: template sheet not found: {args.sheet}", file=sys.stderr)
+        return 2
+
+    src_rows, src_cols = merge_into_template(
+        data_wb.worksheets[0], target_ws, copy_styles=args.copy_styles
+    )
+
+    xlsx_path = outdir / f"{stem}.xlsx"
+    if args.save_xlsx:
+        try:
+            template_wb.save(xlsx_path)
+        except Exception as exc:
+            print(f"Error: failed to save output workbook: {exc}", file=sys.stderr)
+            return 1
+
+    pdf_path = outdir / f"{stem}.pdf"
+    if not args.skip_pdf:
+        try:
+            export_workbook_to_pdf(
+                template_wb, args.sheet_index, pdf_path, soffice_path, args.timeout_seconds
+            )
+        except ConversionError as exc:
+            print(f"Error: failed to export PDF: {exc}", file=sys.stderr)
+            if exc.stderr.strip():
+                print(exc.stderr.strip(), file=sys.stderr)
+            return 5
+        except Exception as exc:
+            print(f"Error: failed to export PDF: {exc}", file=sys.stderr)
+            return 5
+
+    print("Summary:")
+    print(f"  Template: {args.template}")
+    print(f"  Target sheet: {target_ws.title}")
+    print(f"  Copied: {src_rows} rows x {src_cols} cols")
+    if args.save_raw:
+        print(f"  Raw: {raw_path}")
+    if args.save_xlsx:
+        print(f"  Merged: {xlsx_path}")
+    if not args.skip_pdf:
+        print(f"  PDF: {pdf_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,2 @@
+$ErrorActionPreference = "Stop"
+py -3.11 bootstrap.py @args
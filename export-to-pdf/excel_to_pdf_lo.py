@@ -10,6 +10,8 @@ from typing import Optional
 
 from openpyxl import load_workbook
 
+from xlsx_inspect import format_dimension, inspect_workbook
+
 MAC_SOFFICE_CANDIDATES = [
     "/Applications/LibreOffice.app/Contents/MacOS/soffice",
     "/Applications/LibreOfficeDev.app/Contents/MacOS/soffice",
@@ -65,16 +67,18 @@ def resolve_soffice(user_path: Optional[str]) -> Optional[str]:
     return None
 
 
+class ConversionError(RuntimeError):
+    def __init__(self, message: str, stdout: str = "", stderr: str = "") -> None:
+        super().__init__(message)
+        self.stdout = stdout
+        self.stderr = stderr
+
+
 def ensure_output_dir(output_path: Path) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
 
-def prepare_temp_workbook(input_path: Path, sheet_index: int, temp_dir: Path) -> Path:
-    try:
-        wb = load_workbook(input_path)
-    except Exception as exc:  # pragma: no cover - just pass through
-        raise RuntimeError(f"Failed to open Excel file: {exc}") from exc
-
+def hide_other_sheets(wb, sheet_index: int) -> None:
     if sheet_index < 0 or sheet_index >= len(wb.worksheets):
         raise RuntimeError(
             f"Invalid sheet index: {sheet_index}. Sheets available: {len(wb.worksheets)}"
@@ -85,6 +89,15 @@ def prepare_temp_workbook(input_path: Path, sheet_index: int, temp_dir: Path) ->
         if idx != sheet_index:
             ws.sheet_state = "hidden"
 
+
+def prepare_temp_workbook(input_path: Path, sheet_index: int, temp_dir: Path) -> Path:
+    try:
+        wb = load_workbook(input_path)
+    except Exception as exc:  # pragma: no cover - just pass through
+        raise RuntimeError(f"Failed to open Excel file: {exc}") from exc
+
+    hide_other_sheets(wb, sheet_index)
+
     temp_xlsx = temp_dir / f"temp_{input_path.stem}.xlsx"
     wb.save(temp_xlsx)
     return temp_xlsx
@@ -125,6 +138,47 @@ def run_soffice(
     return completed.returncode, completed.stdout, completed.stderr
 
 
+def convert_to_pdf(
+    soffice_path: str,
+    input_xlsx: Path,
+    output_path: Path,
+    timeout_seconds: int,
+) -> None:
+    """Converts input_xlsx via soffice into a scratch folder next to it and moves the PDF to output_path."""
+    temp_out_dir = input_xlsx.parent / "out"
+    temp_out_dir.mkdir(parents=True, exist_ok=True)
+
+    code, stdout, stderr = run_soffice(soffice_path, input_xlsx, temp_out_dir, timeout_seconds)
+    if code == 124:
+        raise ConversionError("conversion timed out", stdout, stderr)
+    if code != 0:
+        raise ConversionError(f"soffice exited with code {code}", stdout, stderr)
+
+    produced_pdf = temp_out_dir / f"{input_xlsx.stem}.pdf"
+    if not produced_pdf.exists():
+        raise ConversionError("PDF was not created")
+
+    try:
+        shutil.move(str(produced_pdf), str(output_path))
+    except Exception as exc:
+        raise ConversionError(f"failed to move PDF: {exc}") from exc
+
+
+def export_workbook_to_pdf(
+    wb,
+    sheet_index: int,
+    output_path: Path,
+    soffice_path: str,
+    timeout_seconds: int,
+) -> None:
+    """Exports one sheet of an in-memory workbook; only a temporary .xlsx touches the disk."""
+    hide_other_sheets(wb, sheet_index)
+    with tempfile.TemporaryDirectory(prefix="xlsx_to_pdf_") as temp_dir:
+        temp_xlsx = Path(temp_dir) / f"temp_{output_path.stem}.xlsx"
+        wb.save(temp_xlsx)
+        convert_to_pdf(soffice_path, temp_xlsx, output_path, timeout_seconds)
+
+
 def parse_args(argv: list[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Export PDF from .xlsx via LibreOffice (headless)."
@@ -163,6 +217,11 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
         default=60,
         help="Conversion timeout in seconds (default: 60)",
     )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Validate input, sheet index and soffice without converting",
+    )
     return parser.parse_args(argv)
 
 
@@ -195,6 +254,26 @@ def main(argv: list[str]) -> int:
         print("Error: input file not found", file=sys.stderr)
         return 2
 
+    # Validate the sheet index from workbook.xml alone before loading any cells.
+    try:
+        sheets = inspect_workbook(input_path)
+    except Exception as exc:
+        print(f"Error: failed to inspect input workbook: {exc}", file=sys.stderr)
+        return 5
+
+    if args.sheet_index < 0 or args.sheet_index >= len(sheets):
+        print(
+            f"Error: invalid sheet index: {args.sheet_index}. Sheets available: {len(sheets)}",
+            file=sys.stderr,
+        )
+        return 5
+
+    if args.dry_run:
+        print("Sheets:")
+        for idx, (name, state, dimension) in enumerate(sheets):
+            marker = "*" if idx == args.sheet_index else " "
+            print(f"  {marker} [{idx}] {name} ({state}, {format_dimension(dimension)})")
+
     soffice_path = resolve_soffice(args.soffice)
     if not soffice_path:
         print(
@@ -215,6 +294,10 @@ def main(argv: list[str]) -> int:
 
     print(f"soffice: {soffice_path}")
 
+    if args.dry_run:
+        print("Dry run: no PDF written.")
+        return 0
+
     try:
         ensure_output_dir(output_path)
     except Exception as exc:
@@ -240,47 +323,14 @@ def main(argv: list[str]) -> int:
     if args.keep_temp:
         print(f"Temporary file: {temp_xlsx}")
 
-    temp_out_dir = temp_dir_path / "out"
-    temp_out_dir.mkdir(parents=True, exist_ok=True)
-
-    code, stdout, stderr = run_soffice(
-        soffice_path,
-        temp_xlsx,
-        temp_out_dir,
-        args.timeout_seconds,
-    )
-
-    if code == 124:
-        print("Error: conversion timed out", file=sys.stderr)
-        if args.keep_temp and stdout:
-            print(stdout)
-        if args.keep_temp and stderr:
-            print(stderr, file=sys.stderr)
-        if temp_dir_handle:
-            temp_dir_handle.cleanup()
-        return 4
-
-    if code != 0:
-        print(f"Error: soffice exited with code {code}", file=sys.stderr)
-        if args.keep_temp and stdout:
-            print(stdout)
-        if args.keep_temp and stderr:
-            print(stderr, file=sys.stderr)
-        if temp_dir_handle:
-            temp_dir_handle.cleanup()
-        return 4
-
-    produced_pdf = temp_out_dir / f"{temp_xlsx.stem}.pdf"
-    if not produced_pdf.exists():
-        print("Error: PDF was not created", file=sys.stderr)
-        if temp_dir_handle:
-            temp_dir_handle.cleanup()
-        return 4
-
     try:
-        shutil.move(str(produced_pdf), str(output_path))
-    except Exception as exc:
-        print(f"Error: failed to move PDF: {exc}", file=sys.stderr)
+        convert_to_pdf(soffice_path, temp_xlsx, output_path, args.timeout_seconds)
+    except ConversionError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        if args.keep_temp and exc.stdout:
+            print(exc.stdout)
+        if args.keep_temp and exc.stderr:
+            print(exc.stderr, file=sys.stderr)
         if temp_dir_handle:
             temp_dir_handle.cleanup()
         return 4
@@ -2,10 +2,19 @@
 import argparse
 import fnmatch
 import os
+import re
+import struct
 import sys
+import tempfile
+import time
 import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import BinaryIO
 
 
 DEFAULT_EXCLUDE_GLOBS = [
@@ -37,6 +46,30 @@ DEFAULT_EXCLUDE_GLOBS = [
     "*.zip",
 ]
 
+# Formats that are already compressed; deflating them again only burns CPU.
+STORED_EXTENSIONS = {
+    ".7z", ".avif", ".bz2", ".docx", ".gif", ".gz", ".jar", ".jpeg", ".jpg",
+    ".key", ".mp3", ".mp4", ".numbers", ".pages", ".png", ".pptx", ".rar",
+    ".tgz", ".webp", ".whl", ".xlsm", ".xlsx", ".xz", ".zip", ".zst",
+}
+ENTROPY_PROBE_BYTES = 64 * 1024
+ENTROPY_PROBE_MIN_SAVING = 0.05
+
+# Files are streamed in chunks; each compressed payload is spooled in memory up
+# to SPOOL_MAX_BYTES and to a temporary file beyond that.
+CHUNK_BYTES = 1024 * 1024
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+MAX_IN_FLIGHT_BYTES = 64 * 1024 * 1024
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+ZIP64_LIMIT = (1 << 31) - 1
+ZIP_FILECOUNT_LIMIT = (1 << 16) - 1
+ZIP_MAX_U32 = 0xFFFFFFFF
+ZIP_MAX_U16 = 0xFFFF
+UTF8_FLAG = 0x800
+CREATE_SYSTEM = 0 if os.name == "nt" else 3
+
 
 def parse_args(argv: list[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -67,14 +100,417 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
         action="store_true",
         help="Do not write zip; only print what would be included",
     )
+    parser.add_argument(
+        "--compresslevel",
+        type=int,
+        default=9,
+        choices=range(0, 10),
+        metavar="0-9",
+        help="Deflate level, 0 stores everything (default: 9)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Compression threads (default: CPU count)",
+    )
+    parser.add_argument(
+        "--update-from",
+        help="Previous portable .zip; unchanged entries are copied without recompressing",
+    )
+    parser.add_argument(
+        "--update-check",
+        choices=["mtime", "crc"],
+        default="mtime",
+        help="How --update-from detects unchanged files: size+mtime, or size+CRC32 (default: mtime)",
+    )
     return parser.parse_args(argv)
 
 
-def should_exclude(rel_posix: str, exclude_globs: list[str]) -> bool:
-    for pattern in exclude_globs:
-        if fnmatch.fnmatch(rel_posix, pattern):
-            return True
-    return False
+def compile_globs(patterns: list[str]) -> re.Pattern | None:
+    if not patterns:
+        return None
+    flags = re.IGNORECASE if os.name == "nt" else 0
+    return re.compile("|".join(fnmatch.translate(p) for p in patterns), flags)
+
+
+def build_matchers(exclude_globs: list[str]) -> tuple[re.Pattern | None, re.Pattern | None]:
+    # "<dir>/**" globs exclude every file below <dir>, so the directory itself
+    # can be pruned before descending; all other globs are applied per file.
+    dir_globs = [p[: -len("/**")] for p in exclude_globs if p.endswith("/**")]
+    return compile_globs(exclude_globs), compile_globs(dir_globs)
+
+
+def should_exclude(rel_posix: str, matcher: re.Pattern | None) -> bool:
+    return matcher is not None and matcher.match(rel_posix) is not None
+
+
+def collect_files(
+    src_root: Path,
+    exclude_globs: list[str],
+    skip_path: Path | None = None,
+) -> list[tuple[Path, str, int]]:
+    file_matcher, dir_matcher = build_matchers(exclude_globs)
+    # Compared against the relative name built during the walk, so no file
+    # needs a realpath() just to check whether it is the output zip.
+    skip_rel = None
+    if skip_path is not None:
+        skip_rel = os.path.normcase(skip_path.relative_to(src_root).as_posix())
+    files: list[tuple[Path, str, int]] = []
+    stack: list[tuple[str, str]] = [(str(src_root), "")]
+
+    while stack:
+        dir_path, rel_dir = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        subdirs: list[tuple[str, str]] = []
+        for entry in entries:
+            rel = f"{rel_dir}{entry.name}"
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not should_exclude(rel, dir_matcher):
+                        subdirs.append((entry.path, f"{rel}/"))
+                    continue
+                if entry.is_dir():
+                    continue
+            except OSError:
+                continue
+
+            if should_exclude(rel, file_matcher):
+                continue
+
+            if skip_rel is not None and os.path.normcase(rel) == skip_rel:
+                continue
+
+            path = Path(entry.path)
+            try:
+                size = entry.stat().st_size
+            except OSError:
+                continue
+
+            files.append((path, rel, size))
+
+        stack.extend(reversed(subdirs))
+
+    return files
+
+
+@dataclass
+class ZipEntry:
+    arcname: str
+    method: int
+    crc: int
+    compress_size: int
+    file_size: int
+    date_time: tuple[int, int, int, int, int, int]
+    external_attr: int
+    data: BinaryIO  # positioned at the payload; closed once written
+
+
+def dos_date_time(date_time: tuple[int, int, int, int, int, int]) -> tuple[int, int]:
+    year, month, day, hour, minute, second = date_time
+    year = min(max(year, 1980), 2107)
+    dos_date = (year - 1980) << 9 | month << 5 | day
+    dos_time = hour << 11 | minute << 5 | second // 2
+    return dos_time, dos_date
+
+
+class RawZipWriter:
+    """Writes already-compressed entries into a zip archive (with zip64 support)."""
+
+    def __init__(self, fp) -> None:
+        self.fp = fp
+        self.central: list[tuple[ZipEntry, int]] = []
+
+    def write_entry(self, entry: ZipEntry) -> None:
+        offset = self.fp.tell()
+        name = entry.arcname.encode("utf-8")
+        zip64 = entry.file_size > ZIP64_LIMIT or entry.compress_size > ZIP64_LIMIT
+        extra = b""
+        file_size, compress_size = entry.file_size, entry.compress_size
+        if zip64:
+            extra = struct.pack("<HHQQ", 0x0001, 16, file_size, compress_size)
+            file_size = compress_size = ZIP_MAX_U32
+        dos_time, dos_date = dos_date_time(entry.date_time)
+        self.fp.write(
+            struct.pack(
+                "<IHHHHHIIIHH",
+                0x04034B50,
+                45 if zip64 else 20,
+                UTF8_FLAG,
+                entry.method,
+                dos_time,
+                dos_date,
+                entry.crc,
+                compress_size,
+                file_size,
+                len(name),
+                len(extra),
+            )
+        )
+        self.fp.write(name)
+        self.fp.write(extra)
+        try:
+            remaining = entry.compress_size
+            while remaining:
+                chunk = entry.data.read(min(CHUNK_BYTES, remaining))
+                if not chunk:
+                    raise zipfile.BadZipFile(f"truncated data for {entry.arcname}")
+                self.fp.write(chunk)
+                remaining -= len(chunk)
+        finally:
+            entry.data.close()
+        self.central.append((entry, offset))
+
+    def close(self) -> None:
+        cd_offset = self.fp.tell()
+        for entry, offset in self.central:
+            name = entry.arcname.encode("utf-8")
+            zip64_fields = []
+            file_size, compress_size, header_offset = entry.file_size, entry.compress_size, offset
+            if file_size > ZIP64_LIMIT:
+                zip64_fields.append(file_size)
+                file_size = ZIP_MAX_U32
+            if compress_size > ZIP64_LIMIT:
+                zip64_fields.append(compress_size)
+                compress_size = ZIP_MAX_U32
+            if header_offset > ZIP64_LIMIT:
+                zip64_fields.append(header_offset)
+                header_offset = ZIP_MAX_U32
+            extra = b""
+            if zip64_fields:
+                extra = struct.pack(
+                    f"<HH{len(zip64_fields)}Q", 0x0001, 8 * len(zip64_fields), *zip64_fields
+                )
+            version = 45 if zip64_fields else 20
+            dos_time, dos_date = dos_date_time(entry.date_time)
+            self.fp.write(
+                struct.pack(
+                    "<IHHHHHHIIIHHHHHII",
+                    0x02014B50,
+                    CREATE_SYSTEM << 8 | version,
+                    version,
+                    UTF8_FLAG,
+                    entry.method,
+                    dos_time,
+                    dos_date,
+                    entry.crc,
+                    compress_size,
+                    file_size,
+                    len(name),
+                    len(extra),
+                    0,
+                    0,
+                    0,
+                    entry.external_attr,
+                    header_offset,
+                )
+            )
+            self.fp.write(name)
+            self.fp.write(extra)
+
+        cd_end = self.fp.tell()
+        count = len(self.central)
+        cd_size = cd_end - cd_offset
+        if count > ZIP_FILECOUNT_LIMIT or cd_offset > ZIP64_LIMIT or cd_size > ZIP64_LIMIT:
+            self.fp.write(
+                struct.pack(
+                    "<IQHHIIQQQQ", 0x06064B50, 44, 45, 45, 0, 0, count, count, cd_size, cd_offset
+                )
+            )
+            self.fp.write(struct.pack("<IIQI", 0x07064B50, 0, cd_end, 1))
+            count = min(count, ZIP_MAX_U16)
+            cd_size = min(cd_size, ZIP_MAX_U32)
+            cd_offset = min(cd_offset, ZIP_MAX_U32)
+        self.fp.write(struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, count, count, cd_size, cd_offset, 0))
+
+
+def looks_incompressible(path: Path, probe: bytes) -> bool:
+    if path.suffix.lower() in STORED_EXTENSIONS:
+        return True
+    if len(probe) < 512:
+        return False
+    return len(zlib.compress(probe, 1)) > len(probe) * (1 - ENTROPY_PROBE_MIN_SAVING)
+
+
+def copy_stream(src: BinaryIO, dst: BinaryIO, compresslevel: int) -> tuple[int, int, int]:
+    """Copies src to dst in chunks, deflating when compresslevel > 0; returns (crc, size, written)."""
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -15) if compresslevel > 0 else None
+    crc = size = written = 0
+    while chunk := src.read(CHUNK_BYTES):
+        crc = zlib.crc32(chunk, crc)
+        size += len(chunk)
+        if compressor is not None:
+            chunk = compressor.compress(chunk)
+        dst.write(chunk)
+        written += len(chunk)
+    if compressor is not None:
+        tail = compressor.flush()
+        dst.write(tail)
+        written += len(tail)
+    return crc, size, written
+
+
+def compress_file(path: Path, arcname: str, compresslevel: int) -> ZipEntry:
+    st = path.stat()
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    try:
+        with open(path, "rb") as src:
+            method = ZIP_STORED
+            if compresslevel > 0 and not looks_incompressible(path, src.read(ENTROPY_PROBE_BYTES)):
+                method = ZIP_DEFLATED
+            src.seek(0)
+            crc, file_size, compress_size = copy_stream(
+                src, spool, compresslevel if method == ZIP_DEFLATED else 0
+            )
+            if method == ZIP_DEFLATED and compress_size >= file_size:
+                # Deflate did not pay off; store the raw bytes instead.
+                method = ZIP_STORED
+                src.seek(0)
+                spool.seek(0)
+                spool.truncate()
+                crc, file_size, compress_size = copy_stream(src, spool, 0)
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    return ZipEntry(
+        arcname=arcname,
+        method=method,
+        crc=crc,
+        compress_size=compress_size,
+        file_size=file_size,
+        date_time=time.localtime(st.st_mtime)[:6],
+        external_attr=(st.st_mode & 0xFFFF) << 16,
+        data=spool,
+    )
+
+
+def load_previous_entries(zip_path: Path) -> dict[str, zipfile.ZipInfo]:
+    with zipfile.ZipFile(zip_path) as zf:
+        return {
+            info.filename: info
+            for info in zf.infolist()
+            if not info.is_dir()
+            and info.compress_type in (ZIP_STORED, ZIP_DEFLATED)
+            and not info.flag_bits & 0x1
+        }
+
+
+def file_crc32(path: Path) -> int:
+    crc = 0
+    with open(path, "rb") as fp:
+        while chunk := fp.read(1024 * 1024):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def is_unchanged(path: Path, info: zipfile.ZipInfo, update_check: str) -> bool:
+    st = path.stat()
+    if st.st_size != info.file_size:
+        return False
+    if update_check == "crc":
+        return file_crc32(path) == info.CRC
+    return dos_date_time(time.localtime(st.st_mtime)[:6]) == dos_date_time(info.date_time)
+
+
+def read_raw_entry(zip_path: Path, info: zipfile.ZipInfo, path: Path) -> ZipEntry:
+    # The payload is not read here; the writer copies it straight from the old zip.
+    fp = open(zip_path, "rb")
+    try:
+        fp.seek(info.header_offset)
+        header = fp.read(30)
+        if len(header) != 30 or header[:4] != b"PK\x03\x04":
+            raise zipfile.BadZipFile(f"bad local header for {info.filename}")
+        name_len, extra_len = struct.unpack("<HH", header[26:30])
+        fp.seek(name_len + extra_len, os.SEEK_CUR)
+        st = path.stat()
+    except BaseException:
+        fp.close()
+        raise
+    return ZipEntry(
+        arcname=info.filename,
+        method=info.compress_type,
+        crc=info.CRC,
+        compress_size=info.compress_size,
+        file_size=info.file_size,
+        date_time=time.localtime(st.st_mtime)[:6],
+        external_attr=(st.st_mode & 0xFFFF) << 16,
+        data=fp,
+    )
+
+
+def build_entry(
+    path: Path,
+    arcname: str,
+    compresslevel: int,
+    previous_zip: Path | None,
+    previous: zipfile.ZipInfo | None,
+    update_check: str,
+) -> tuple[ZipEntry, bool]:
+    if previous is not None and is_unchanged(path, previous, update_check):
+        return read_raw_entry(previous_zip, previous, path), True
+    return compress_file(path, arcname, compresslevel), False
+
+
+def write_zip(
+    output_path: Path,
+    files_to_add: list[tuple[Path, str, int]],
+    compresslevel: int,
+    jobs: int,
+    previous_zip: Path | None = None,
+    update_check: str = "mtime",
+) -> tuple[int, int, int]:
+    """Builds entries on a thread pool and writes them in order; returns (reused, stored, deflated).
+
+    Work in flight is bounded by the bytes it may hold in memory, so a few
+    large files cannot pile up next to each other.
+    """
+    previous = load_previous_entries(previous_zip) if previous_zip else {}
+    reused = stored = deflated = 0
+    max_in_flight = max(1, jobs) * 4
+    with open(output_path, "wb") as fp, ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        writer = RawZipWriter(fp)
+        pending = deque()
+        in_flight_bytes = 0
+        items = iter(files_to_add)
+        item = next(items, None)
+        while True:
+            while item is not None and len(pending) < max_in_flight:
+                path, rel, size = item
+                cost = min(size, SPOOL_MAX_BYTES) + CHUNK_BYTES
+                if pending and in_flight_bytes + cost > MAX_IN_FLIGHT_BYTES:
+                    break
+                future = pool.submit(
+                    build_entry,
+                    path,
+                    rel,
+                    compresslevel,
+                    previous_zip,
+                    previous.get(rel),
+                    update_check,
+                )
+                pending.append((future, cost))
+                in_flight_bytes += cost
+                item = next(items, None)
+            if not pending:
+                break
+            future, cost = pending.popleft()
+            entry, was_reused = future.result()
+            if was_reused:
+                reused += 1
+            elif entry.method == ZIP_DEFLATED:
+                deflated += 1
+            else:
+                stored += 1
+            writer.write_entry(entry)
+            in_flight_bytes -= cost
+        writer.close()
+    return reused, stored, deflated
 
 
 def default_output_path(src_root: Path) -> Path:
@@ -100,33 +536,20 @@ def main(argv: list[str]) -> int:
         print("Use --overwrite to replace it.", file=sys.stderr)
         return 3
 
-    exclude_globs = DEFAULT_EXCLUDE_GLOBS + list(args.exclude)
-
-    files_to_add: list[tuple[Path, str]] = []
-    total_bytes = 0
-
-    for path in src_root.rglob("*"):
-        if path.is_dir():
-            continue
-
-        try:
-            rel = path.relative_to(src_root).as_posix()
-        except ValueError:
-            continue
-
-        if output_path.is_relative_to(src_root) and path.resolve() == output_path:
-            continue
+    if args.jobs <= 0:
+        print("Error: --jobs must be positive", file=sys.stderr)
+        return 2
 
-        if should_exclude(rel, exclude_globs):
-            continue
+    previous_zip = Path(args.update_from).resolve() if args.update_from else None
+    if previous_zip is not None and not zipfile.is_zipfile(previous_zip):
+        print(f"Error: --update-from is not a readable zip: {previous_zip}", file=sys.stderr)
+        return 2
 
-        try:
-            st = path.stat()
-        except OSError:
-            continue
+    exclude_globs = DEFAULT_EXCLUDE_GLOBS + list(args.exclude)
 
-        files_to_add.append((path, rel))
-        total_bytes += st.st_size
+    skip_path = output_path if output_path.is_relative_to(src_root) else None
+    files_to_add = collect_files(src_root, exclude_globs, skip_path)
+    total_bytes = sum(size for _, _, size in files_to_add)
 
     print(f"Source:  {src_root}")
     print(f"Output:  {output_path}")
@@ -137,19 +560,27 @@ def main(argv: list[str]) -> int:
         return 0
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    mode = "w"
-    compression = zipfile.ZIP_DEFLATED
-    compresslevel = 9
-
-    with zipfile.ZipFile(
-        output_path,
-        mode=mode,
-        compression=compression,
-        compresslevel=compresslevel,
-    ) as zf:
-        for path, rel in files_to_add:
-            zf.write(path, arcname=rel)
+    # Write next to the target and swap in at the end, so --update-from may
+    # point at the zip being replaced.
+    temp_path = output_path.with_name(f"{output_path.name}.tmp")
+    try:
+        reused, stored, deflated = write_zip(
+            temp_path,
+            files_to_add,
+            args.compresslevel,
+            args.jobs,
+            previous_zip,
+            args.update_check,
+        )
+        os.replace(temp_path, output_path)
+    except (OSError, zipfile.BadZipFile) as exc:
+        temp_path.unlink(missing_ok=True)
+        print(f"Error: failed to write zip: {exc}", file=sys.stderr)
+        return 1
 
+    if previous_zip is not None:
+        print(f"Reused:  {reused} unchanged entries from {previous_zip}")
+    print(f"Entries: {deflated} deflated, {stored} stored")
     print("Done.")
     return 0
 
@@ -1,10 +1,73 @@
 #!/usr/bin/env python3
 import argparse
+import cProfile
+import json
 import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from copy import copy
 from datetime import datetime
 from pathlib import Path
 
 from openpyxl import load_workbook
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.styles.named_styles import NamedStyle
+from openpyxl.styles.numbers import BUILTIN_FORMATS_MAX_SIZE, BUILTIN_FORMATS_REVERSE
+
+from sharded_reader import ShardedSheet, ShardError, read_sheet_parallel
+from xlsx_package import format_dimension, inspect_workbook
+
+
+class PhaseProfiler:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.phases = []
+
+    def start(self):
+        if self.enabled:
+            tracemalloc.start()
+
+    def stop(self):
+        if self.enabled and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        # reset_peak() resets to the memory already traced, so the phase's own
+        # peak is measured against what earlier phases left behind.
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            current, peak = tracemalloc.get_traced_memory()
+            self.phases.append(
+                {
+                    "name": name,
+                    "wall_seconds": round(wall, 6),
+                    "peak_bytes": peak - baseline,
+                    "absolute_peak_bytes": peak,
+                    "current_bytes": current,
+                }
+            )
+
+    def print_report(self):
+        print("Profile:")
+        for item in self.phases:
+            print(
+                f"  {item['name']:<14} {item['wall_seconds']:9.3f} s"
+                f"  peak {item['peak_bytes'] / (1024 * 1024):8.1f} MiB"
+                f"  absolute peak {item['absolute_peak_bytes'] / (1024 * 1024):8.1f} MiB"
+                f"  retained {item['current_bytes'] / (1024 * 1024):8.1f} MiB"
+            )
+        total = sum(item["wall_seconds"] for item in self.phases)
+        print(f"  {'total':<14} {total:9.3f} s")
 
 
 def find_sheet_case_insensitive(wb, name):
@@ -16,30 +79,154 @@ def find_sheet_case_insensitive(wb, name):
 
 
 def get_used_range(ws):
-    max_row = ws.max_row or 0
-    max_col = ws.max_column or 0
-    if max_row <= 1 and max_col <= 1 and ws["A1"].value is None:
-        return 0, 0
+    # ws.max_row/max_column also count cells that only carry formatting, so a
+    # template styled down to row 1,048,576 reports a million-row grid. Walk
+    # the sheet's sparse cell storage and keep only cells holding a value.
+    max_row = 0
+    max_col = 0
+    for (row, col), cell in ws._cells.items():
+        if cell.value is None:
+            continue
+        if row > max_row:
+            max_row = row
+        if col > max_col:
+            max_col = col
     return max_row, max_col
 
 
 def clear_values(ws, max_row, max_col):
     if max_row <= 0 or max_col <= 0:
         return
-    for row in ws.iter_rows(min_row=1, max_row=max_row, min_col=1, max_col=max_col):
-        for cell in row:
+    for (row, col), cell in ws._cells.items():
+        if row <= max_row and col <= max_col and cell.value is not None:
             cell.value = None
 
 
-def copy_values_and_formats(src_ws, dst_ws, max_row, max_col):
+class StyleInterner:
+    """Maps source cell styles to destination workbook styles, once per distinct style."""
+
+    def __init__(self, src_wb, dst_wb):
+        self.src_wb = src_wb
+        self.dst_wb = dst_wb
+        self.cache = {}
+
+    def map(self, src_style):
+        if not src_style:
+            src_style = StyleArray()
+        key = tuple(src_style)
+        dst_style = self.cache.get(key)
+        if dst_style is None:
+            dst_style = self.cache[key] = self._translate(src_style)
+        return StyleArray(dst_style)
+
+    def _translate(self, src_style):
+        src, dst = self.src_wb, self.dst_wb
+        if src is dst:
+            return StyleArray(src_style)
+        dst_style = StyleArray()
+        dst_style.fontId = dst._fonts.add(src._fonts[src_style.fontId])
+        dst_style.fillId = dst._fills.add(src._fills[src_style.fillId])
+        dst_style.borderId = dst._borders.add(src._borders[src_style.borderId])
+        dst_style.alignmentId = dst._alignments.add(src._alignments[src_style.alignmentId])
+        dst_style.protectionId = dst._protections.add(src._protections[src_style.protectionId])
+        dst_style.numFmtId = self._translate_number_format(src_style.numFmtId)
+        dst_style.xfId = self._translate_named_style(src_style.xfId)
+        dst_style.pivotButton = src_style.pivotButton
+        dst_style.quotePrefix = src_style.quotePrefix
+        return dst_style
+
+    def _translate_number_format(self, fmt_id):
+        if fmt_id < BUILTIN_FORMATS_MAX_SIZE:
+            return fmt_id
+        fmt = self.src_wb._number_formats[fmt_id - BUILTIN_FORMATS_MAX_SIZE]
+        if fmt in BUILTIN_FORMATS_REVERSE:
+            return BUILTIN_FORMATS_REVERSE[fmt]
+        return self.dst_wb._number_formats.add(fmt) + BUILTIN_FORMATS_MAX_SIZE
+
+    def _translate_named_style(self, xf_id):
+        try:
+            src_named = self.src_wb._named_styles[xf_id]
+        except IndexError:
+            return 0
+        names = self.dst_wb._named_styles.names
+        if src_named.name not in names:
+            # Named styles missing from the template are added, not collapsed to Normal.
+            self.dst_wb.add_named_style(
+                NamedStyle(
+                    name=src_named.name,
+                    font=copy(src_named.font),
+                    fill=copy(src_named.fill),
+                    border=copy(src_named.border),
+                    alignment=copy(src_named.alignment),
+                    number_format=src_named.number_format,
+                    protection=copy(src_named.protection),
+                    builtinId=src_named.builtinId,
+                    hidden=src_named.hidden,
+                )
+            )
+            names = self.dst_wb._named_styles.names
+        return names.index(src_named.name)
+
+
+def copy_dimensions(src_ws, dst_ws, max_row, max_col):
+    for key, src_dim in src_ws.column_dimensions.items():
+        if src_dim.min is not None and src_dim.min > max_col:
+            continue
+        dst_dim = dst_ws.column_dimensions[key]
+        dst_dim.width = src_dim.width
+        dst_dim.hidden = src_dim.hidden
+        dst_dim.min = src_dim.min
+        dst_dim.max = src_dim.max
+    for idx, src_dim in src_ws.row_dimensions.items():
+        if idx > max_row:
+            continue
+        dst_dim = dst_ws.row_dimensions[idx]
+        dst_dim.height = src_dim.height
+        dst_dim.hidden = src_dim.hidden
+
+
+def copy_values_and_formats(src_ws, dst_ws, max_row, max_col, copy_styles=False):
     if max_row <= 0 or max_col <= 0:
         return
-    for r in range(1, max_row + 1):
-        for c in range(1, max_col + 1):
-            src_cell = src_ws.cell(row=r, column=c)
-            dst_cell = dst_ws.cell(row=r, column=c)
-            dst_cell.value = src_cell.value
+    styles = StyleInterner(src_ws.parent, dst_ws.parent) if copy_styles else None
+    for (row, col), src_cell in list(src_ws._cells.items()):
+        if row > max_row or col > max_col:
+            continue
+        dst_cell = dst_ws.cell(row=row, column=col)
+        dst_cell.value = src_cell.value
+        if styles is not None:
+            dst_cell._style = styles.map(src_cell._style)
+        else:
             dst_cell.number_format = src_cell.number_format
+    if copy_styles:
+        copy_dimensions(src_ws, dst_ws, max_row, max_col)
+
+
+def copy_cell_records(src_sheet, dst_ws, max_row, max_col):
+    if max_row <= 0 or max_col <= 0:
+        return
+    for row, col, value, number_format in src_sheet.cells:
+        if row > max_row or col > max_col:
+            continue
+        dst_cell = dst_ws.cell(row=row, column=col)
+        dst_cell.value = value
+        dst_cell.number_format = number_format
+
+
+def merge_into_template(source_ws, target_ws, profiler=None, copy_styles=False):
+    profiler = profiler or PhaseProfiler()
+    with profiler.phase("clear_values"):
+        tmpl_rows, tmpl_cols = get_used_range(target_ws)
+        clear_values(target_ws, tmpl_rows, tmpl_cols)
+
+    with profiler.phase("copy"):
+        if isinstance(source_ws, ShardedSheet):
+            src_rows, src_cols = source_ws.used_range()
+            copy_cell_records(source_ws, target_ws, src_rows, src_cols)
+        else:
+            src_rows, src_cols = get_used_range(source_ws)
+            copy_values_and_formats(source_ws, target_ws, src_rows, src_cols, copy_styles)
+    return src_rows, src_cols
 
 
 def build_output_path(outdir, prefix):
@@ -59,6 +246,12 @@ def parse_args(argv):
     parser.add_argument("--sheet", default="data", help="Target sheet name in template (default: data)")
     parser.add_argument("--prefix", default="", help="Output filename prefix (default: empty)")
     parser.add_argument("--dry-run", action="store_true", help="Validate and print actions without writing output")
+    parser.add_argument("--copy-styles", action="store_true", help="Copy full cell styles, column widths and row heights from the data sheet")
+    parser.add_argument("--parallel-read", action="store_true", help="Parse the data sheet in row-range shards across worker processes")
+    parser.add_argument("--read-workers", type=int, default=None, help="Worker processes for --parallel-read (default: CPU count)")
+    parser.add_argument("--profile", action="store_true", help="Report wall time and tracemalloc peak per phase")
+    parser.add_argument("--profile-json", default=None, help="Write the per-phase profile as JSON to this path (implies --profile)")
+    parser.add_argument("--cprofile", default=None, help="Dump cProfile stats of the whole merge to this path")
     return parser.parse_args(argv)
 
 
@@ -86,8 +279,64 @@ def resolve_default_outdir(project_root):
     return project_root / "out"
 
 
-def main(argv):
-    args = parse_args(argv)
+def load_data_sheet(data_path, parallel_read=False, read_workers=None):
+    if parallel_read:
+        try:
+            return read_sheet_parallel(data_path, 0, read_workers)
+        except ShardError:
+            # Sheets the sharded reader cannot split (e.g. rows without
+            # references) are read the regular way.
+            pass
+    data_wb = load_workbook(data_path, data_only=False)
+    if len(data_wb.sheetnames) == 0:
+        return None
+    return data_wb.worksheets[0]
+
+
+def inspect_merge(template_path, data_path, outdir, args):
+    # Dry runs only read workbook.xml and each sheet's <dimension>; no cells are loaded.
+    try:
+        template_sheets = inspect_workbook(template_path)
+    except Exception as exc:
+        print(f"Error: failed to open template workbook: {exc}", file=sys.stderr)
+        return 1
+
+    try:
+        data_sheets = inspect_workbook(data_path)
+    except Exception as exc:
+        print(f"Error: failed to open data workbook: {exc}", file=sys.stderr)
+        return 1
+
+    target = args.sheet.strip().lower()
+    target_name = next((name for name, _, _ in template_sheets if name.lower() == target), None)
+    if target_name is None:
+        print(f"Error: template sheet not found: {args.sheet}", file=sys.stderr)
+        return 2
+
+    if len(data_sheets) == 0:
+        print("Error: data workbook has no sheets", file=sys.stderr)
+        return 3
+
+    source_name, _, source_dimension = data_sheets[0]
+
+    print("Dry run: no output written.")
+    print("Summary:")
+    print(f"  Template: {template_path}")
+    print(f"  Data: {data_path}")
+    print(f"  Target sheet: {target_name}")
+    print(f"  Source sheet: {source_name}")
+    print(f"  Would copy: {format_dimension(source_dimension)} (from sheet dimension)")
+    print(f"  Output: {build_output_path(outdir, args.prefix)}")
+    return 0
+
+
+def run(args, profiler):
+    if args.parallel_read and args.copy_styles:
+        print("Error: --copy-styles cannot be combined with --parallel-read", file=sys.stderr)
+        return 2
+    if args.read_workers is not None and args.read_workers <= 0:
+        print("Error: --read-workers must be positive", file=sys.stderr)
+        return 2
 
     project_root = Path(__file__).resolve().parent.parent
 
@@ -99,14 +348,19 @@ def main(argv):
         print(f"Error: {exc}", file=sys.stderr)
         return 1
 
+    if args.dry_run:
+        return inspect_merge(template_path, data_path, outdir, args)
+
     try:
-        template_wb = load_workbook(template_path)
+        with profiler.phase("template_load"):
+            template_wb = load_workbook(template_path)
     except Exception as exc:
         print(f"Error: failed to open template workbook: {exc}", file=sys.stderr)
         return 1
 
     try:
-        data_wb = load_workbook(data_path, data_only=False)
+        with profiler.phase("data_load"):
+            source_ws = load_data_sheet(data_path, args.parallel_read, args.read_workers)
     except Exception as exc:
         print(f"Error: failed to open data workbook: {exc}", file=sys.stderr)
         return 1
@@ -116,29 +370,21 @@ def main(argv):
         print(f"Error: template sheet not found: {args.sheet}", file=sys.stderr)
         return 2
 
-    if len(data_wb.sheetnames) == 0:
+    if source_ws is None:
         print("Error: data workbook has no sheets", file=sys.stderr)
         return 3
 
-    source_ws = data_wb.worksheets[0]
-
-    tmpl_rows, tmpl_cols = get_used_range(target_ws)
-    clear_values(target_ws, tmpl_rows, tmpl_cols)
-
-    src_rows, src_cols = get_used_range(source_ws)
-    copy_values_and_formats(source_ws, target_ws, src_rows, src_cols)
+    src_rows, src_cols = merge_into_template(source_ws, target_ws, profiler, args.copy_styles)
 
     out_path = build_output_path(outdir, args.prefix)
 
-    if args.dry_run:
-        print("Dry run: no output written.")
-    else:
-        outdir.mkdir(parents=True, exist_ok=True)
-        try:
+    outdir.mkdir(parents=True, exist_ok=True)
+    try:
+        with profiler.phase("save"):
             template_wb.save(out_path)
-        except Exception as exc:
-            print(f"Error: failed to save output workbook: {exc}", file=sys.stderr)
-            return 1
+    except Exception as exc:
+        print(f"Error: failed to save output workbook: {exc}", file=sys.stderr)
+        return 1
 
     print("Summary:")
     print(f"  Template: {template_path}")
@@ -148,8 +394,42 @@ def main(argv):
     print(f"  Copied: {src_rows} rows x {src_cols} cols")
     print(f"  Output: {out_path}")
 
+    if profiler.enabled:
+        profiler.print_report()
+        if args.profile_json:
+            record = {
+                "template": str(template_path),
+                "data": str(data_path),
+                "rows": src_rows,
+                "cols": src_cols,
+                "phases": profiler.phases,
+            }
+            try:
+                Path(args.profile_json).write_text(json.dumps(record, indent=2), encoding="utf-8")
+            except OSError as exc:
+                print(f"Error: failed to write profile JSON: {exc}", file=sys.stderr)
+                return 1
+
     return 0
 
 
+def main(argv):
+    args = parse_args(argv)
+
+    profiler = PhaseProfiler(enabled=args.profile or bool(args.profile_json))
+    cprofiler = cProfile.Profile() if args.cprofile else None
+
+    profiler.start()
+    if cprofiler:
+        cprofiler.enable()
+    try:
+        return run(args, profiler)
+    finally:
+        if cprofiler:
+            cprofiler.disable()
+            cprofiler.dump_stats(args.cprofile)
+        profiler.stop()
+
+
 if __name__ == "__main__":
     raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import pickle
+import sys
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from openpyxl import load_workbook
+
+from merge_excel import (
+    build_output_path,
+    find_sheet_case_insensitive,
+    load_data_sheet,
+    merge_into_template,
+    resolve_default_outdir,
+    resolve_default_template,
+)
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+MAX_REQUEST_BYTES = 1024 * 1024
+LOOPBACK_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+_template_cache = None
+
+
+class MergeError(Exception):
+    def __init__(self, status, message):
+        super().__init__(status, message)
+        self.status = status
+        self.message = message
+
+    def __str__(self):
+        return self.message
+
+
+class TemplateCache:
+    """Parsed templates kept as pickled snapshots, LRU-evicted and reloaded when the file changes.
+
+    Every merge mutates its workbook, so each request gets its own copy
+    unpickled from the snapshot, which is much cheaper than parsing the xlsx.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, path):
+        st = path.stat()
+        key = str(path.resolve())
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self.entries.move_to_end(key)
+                return pickle.loads(entry[1])
+
+        wb = load_workbook(path)
+        try:
+            snapshot = pickle.dumps(wb, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # Workbooks holding unpicklable objects are simply reloaded each time.
+            return wb
+
+        with self.lock:
+            self.entries[key] = (stamp, snapshot)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return wb
+
+
+def init_worker(cache_size):
+    global _template_cache
+    _template_cache = TemplateCache(cache_size)
+
+
+class WorkerPool:
+    """Merge worker processes; the pool is replaced when a worker dies (OOM, crash in a C extension).
+
+    A dead worker breaks the whole ProcessPoolExecutor. The jobs in flight on
+    it fail (there is no telling which one killed the worker, and retrying the
+    culprit would take the new pool down too), later jobs run on a fresh pool.
+    """
+
+    def __init__(self, workers, cache_size):
+        self.workers = workers
+        self.cache_size = cache_size
+        self.lock = threading.Lock()
+        self.executor = self._create()
+
+    def _create(self):
+        # Workers start lazily from handler threads; forking a multi-threaded
+        # process can deadlock on locks other threads hold, so never fork
+        # (forkserver is not available on Windows, where spawn is the default).
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=init_worker,
+            initargs=(self.cache_size,),
+        )
+
+    def _replace(self, broken):
+        with self.lock:
+            if self.executor is broken:
+                self.executor = self._create()
+            executor = self.executor
+        broken.shutdown(wait=False)
+        return executor
+
+    def run(self, fn, *args):
+        executor = self.executor
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            # The pool broke before this job was queued, so it cannot be the culprit.
+            executor = self._replace(executor)
+            future = executor.submit(fn, *args)
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            self._replace(executor)
+            raise
+
+    def shutdown(self):
+        self.executor.shutdown()
+
+
+def unique_output_path(outdir, prefix):
+    # Concurrent merges within the same second must not overwrite each other.
+    path = build_output_path(outdir, prefix)
+    return path.with_name(f"{path.stem}_{uuid.uuid4().hex[:8]}{path.suffix}")
+
+
+def merge_job(request):
+    """Runs one merge inside a worker process; returns a JSON-able result (plus bytes if requested)."""
+    template_path = Path(request.get("template") or resolve_default_template(PROJECT_ROOT))
+    data_value = request.get("data")
+    if not data_value:
+        raise MergeError(400, "missing 'data' path")
+    data_path = Path(data_value)
+    for label, path in (("template", template_path), ("data", data_path)):
+        if not path.is_file():
+            raise MergeError(404, f"{label} file not found: {path}")
+
+    try:
+        template_wb = _template_cache.get(template_path)
+    except Exception as exc:
+        raise MergeError(422, f"failed to open template workbook: {exc}") from exc
+
+    sheet = request.get("sheet") or "data"
+    target_ws = find_sheet_case_insensitive(template_wb, sheet)
+    if target_ws is None:
+        raise MergeError(422, f"template sheet not found: {sheet}")
+
+    try:
+        source_ws = load_data_sheet(data_path)
+    except Exception as exc:
+        raise MergeError(422, f"failed to open data workbook: {exc}") from exc
+    if source_ws is None:
+        raise MergeError(422, "data workbook has no sheets")
+
+    src_rows, src_cols = merge_into_template(
+        source_ws, target_ws, copy_styles=bool(request.get("copy_styles"))
+    )
+    result = {
+        "template": str(template_path),
+        "data": str(data_path),
+        "target_sheet": target_ws.title,
+        "source_sheet": source_ws.title,
+        "rows": src_rows,
+        "cols": src_cols,
+    }
+
+    if request.get("return") == "bytes":
+        buffer = io.BytesIO()
+        template_wb.save(buffer)
+        return result, buffer.getvalue()
+
+    outdir = Path(request.get("outdir") or resolve_default_outdir(PROJECT_ROOT))
+    outdir.mkdir(parents=True, exist_ok=True)
+    out_path = unique_output_path(outdir, request.get("prefix") or "")
+    template_wb.save(out_path)
+    result["output"] = str(out_path)
+    return result, None
+
+
+def host_name(host_header):
+    # "localhost:8765" -> "localhost", "[::1]:8765" -> "::1"
+    host = host_header.strip().lower()
+    if host.startswith("["):
+        return host[1:].split("]", 1)[0]
+    return host.rsplit(":", 1)[0] if host.count(":") == 1 else host
+
+
+class MergeRequestHandler(BaseHTTPRequestHandler):
+    server_version = "MergeService/1.0"
+
+    def check_local_request(self):
+        """Returns an error for requests a web page could have sent, or None.
+
+        Browsers send cross-origin POSTs with an Origin header, and a JSON
+        Content-Type forces a preflight this server never answers. The Host
+        check stops DNS-rebinding pages that pose as same-origin.
+        """
+        if self.headers.get("Origin") is not None:
+            return 403, "cross-origin requests are not allowed"
+        if host_name(self.headers.get("Host") or "") not in self.server.allowed_hosts:
+            return 403, "Host header must name this machine"
+        content_type = (self.headers.get("Content-Type") or "").split(";", 1)[0].strip().lower()
+        if content_type != "application/json":
+            return 415, "Content-Type must be application/json"
+        return None
+
+    def do_GET(self):
+        if self.path != "/health":
+            self.send_json(404, {"error": "not found"})
+            return
+        self.send_json(200, {"status": "ok", "workers": self.server.workers})
+
+    def do_POST(self):
+        if self.path != "/merge":
+            self.send_json(404, {"error": "not found"})
+            return
+
+        rejected = self.check_local_request()
+        if rejected is not None:
+            self.send_json(rejected[0], {"error": rejected[1]})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = 0
+        if length <= 0 or length > MAX_REQUEST_BYTES:
+            self.send_json(400, {"error": "request body must be a JSON object"})
+            return
+        try:
+            request = json.loads(self.rfile.read(length))
+            if not isinstance(request, dict):
+                raise ValueError("not an object")
+        except ValueError:
+            self.send_json(400, {"error": "request body must be a JSON object"})
+            return
+
+        try:
+            result, payload = self.server.pool.run(merge_job, request)
+        except MergeError as exc:
+            self.send_json(exc.status, {"error": str(exc)})
+            return
+        except BrokenProcessPool:
+            self.send_json(500, {"error": "merge failed: worker process died"})
+            return
+        except Exception as exc:
+            self.send_json(500, {"error": f"merge failed: {exc}"})
+            return
+
+        if payload is None:
+            self.send_json(200, result)
+            return
+        self.send_response(200)
+        self.send_header(
+            "Content-Type",
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("X-Merge-Result", json.dumps(result))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Long-running merge service on localhost HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port (default: 8765)")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1), help="Merge worker processes (default: min(4, CPU count))")
+    parser.add_argument("--cache-size", type=int, default=8, help="Templates kept in memory per worker (default: 8)")
+    parser.add_argument("--quiet", action="store_true", help="Do not log requests")
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    args = parse_args(argv)
+    if args.workers <= 0 or args.cache_size <= 0:
+        print("Error: --workers and --cache-size must be positive", file=sys.stderr)
+        return 2
+
+    pool = WorkerPool(args.workers, args.cache_size)
+    try:
+        server = ThreadingHTTPServer((args.host, args.port), MergeRequestHandler)
+    except OSError as exc:
+        pool.shutdown()
+        print(f"Error: failed to bind {args.host}:{args.port}: {exc}", file=sys.stderr)
+        return 1
+
+    server.pool = pool
+    server.workers = args.workers
+    server.quiet = args.quiet
+    server.allowed_hosts = LOOPBACK_HOSTS | {host_name(args.host)}
+    print(f"Merge service listening on http://{args.host}:{server.server_port} ({args.workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,231 @@
+import os
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from openpyxl.formula.translate import Translator
+from openpyxl.utils.cell import get_column_letter
+from openpyxl.styles.numbers import is_date_format, is_timedelta_format
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, WINDOWS_EPOCH, from_excel, from_ISO8601
+from openpyxl.worksheet.formula import ArrayFormula, DataTableFormula
+
+from xlsx_package import (
+    find_child,
+    local_name,
+    read_cell_number_formats,
+    read_date1904,
+    read_shared_strings,
+    read_sheets,
+    string_item_text,
+    workbook_part,
+)
+
+
+# Below this size a single in-process parse beats the pool start-up cost.
+MIN_PARALLEL_BYTES = 8 * 1024 * 1024
+SHARDS_PER_WORKER = 4
+
+ROOT_TAG_RE = re.compile(rb"<([A-Za-z_][\w.-]*:)?worksheet[\s>]")
+SHEET_DATA_RE = re.compile(rb"<([A-Za-z_][\w.-]*:)?sheetData(\s[^>]*)?(/?)>")
+CELL_REF_RE = re.compile(r"([A-Z]+)(\d+)")
+
+_shared_strings = []
+
+
+class ShardError(ValueError):
+    pass
+
+
+class ShardedSheet:
+    """Cell records of one worksheet: (row, col, value, number_format), in document order."""
+
+    def __init__(self, title, cells):
+        self.title = title
+        self.cells = cells
+
+    def used_range(self):
+        max_row = 0
+        max_col = 0
+        for row, col, value, _ in self.cells:
+            if value is None:
+                continue
+            if row > max_row:
+                max_row = row
+            if col > max_col:
+                max_col = col
+        return max_row, max_col
+
+
+def column_index(letters):
+    index = 0
+    for char in letters:
+        index = index * 26 + ord(char) - 64
+    return index
+
+
+def split_shards(xml, shard_count):
+    """Splits worksheet XML into standalone documents, each holding a run of whole <row> elements."""
+    root_match = ROOT_TAG_RE.search(xml)
+    data_match = SHEET_DATA_RE.search(xml)
+    if root_match is None or data_match is None:
+        raise ShardError("worksheet has no sheetData element")
+    if data_match.group(3):
+        return []
+
+    prefix = data_match.group(1) or b""
+    root_end = xml.index(b">", root_match.start()) + 1
+    head = xml[root_match.start():root_end] + b"<" + prefix + b"sheetData>"
+    tail = b"</" + prefix + b"sheetData></" + (root_match.group(1) or b"") + b"worksheet>"
+
+    start = data_match.end()
+    end = xml.find(b"</" + prefix + b"sheetData>", start)
+    if end < 0:
+        raise ShardError("unterminated sheetData element")
+
+    row_re = re.compile(b"<" + re.escape(prefix) + rb"row[\s>/]")
+    step = max(1, (end - start) // max(1, shard_count))
+    shards = []
+    shard_start = start
+    while shard_start < end:
+        match = row_re.search(xml, min(shard_start + step, end), end)
+        cut = match.start() if match else end
+        shards.append(head + xml[shard_start:cut] + tail)
+        shard_start = cut
+    return shards
+
+
+def _init_worker(shared_strings):
+    global _shared_strings
+    _shared_strings = shared_strings
+
+
+def _cast_number(text):
+    if "." in text or "E" in text or "e" in text:
+        return float(text)
+    return int(text)
+
+
+def parse_shard(shard, first=True):
+    """Returns ([(row, col, value, style_index)], [(si, row, col, formula)]) for one shard.
+
+    Dependent cells of shared formulas carry ("shared", si) as value; the caller
+    translates them once all masters are known. Rows without an r attribute are
+    numbered after the previous row, which is only known for the first shard.
+    """
+    cells = []
+    masters = []
+    row = 0 if first else None
+    root = ET.fromstring(shard)
+    sheet_data = find_child(root, "sheetData")
+    for row_el in sheet_data:
+        ref = row_el.get("r")
+        if ref is not None:
+            row = int(ref)
+        elif row is None:
+            raise ShardError("row without r attribute cannot be sharded")
+        else:
+            row += 1
+        col = 0
+        for cell_el in row_el:
+            cell_ref = cell_el.get("r")
+            if cell_ref is None:
+                col += 1
+            else:
+                col = column_index(CELL_REF_RE.match(cell_ref).group(1))
+            cell_type = cell_el.get("t", "n")
+            style = int(cell_el.get("s", 0))
+            value = None
+            formula = None
+            value_text = None
+            for child in cell_el:
+                name = local_name(child.tag)
+                if name == "v":
+                    value_text = child.text
+                elif name == "f":
+                    formula = child
+                elif name == "is":
+                    value = string_item_text(child)
+
+            # Formula handling mirrors openpyxl's WorkSheetParser.parse_formula.
+            formula_type = formula.get("t") if formula is not None else None
+            if formula_type == "shared" and not formula.text:
+                value = ("shared", formula.get("si"))
+            elif formula_type == "array":
+                value = ArrayFormula(ref=formula.get("ref"), text=f"={formula.text or ''}")
+            elif formula_type == "dataTable":
+                value = DataTableFormula(**formula.attrib)
+            elif formula is not None and formula.text:
+                value = f"={formula.text}"
+                if formula.get("t") == "shared":
+                    masters.append((formula.get("si"), row, col, value))
+            elif value_text is not None:
+                if cell_type == "s":
+                    value = _shared_strings[int(value_text)]
+                elif cell_type == "b":
+                    value = value_text == "1"
+                elif cell_type in ("str", "e"):
+                    value = value_text
+                elif cell_type == "d":
+                    value = from_ISO8601(value_text)
+                else:
+                    value = _cast_number(value_text)
+            cells.append((row, col, value, style))
+    return cells, masters
+
+
+def read_sheet_parallel(path, sheet_index=0, workers=None):
+    """Reads one worksheet by parsing row-range shards of its XML in worker processes."""
+    workers = workers or os.cpu_count() or 1
+    with zipfile.ZipFile(path) as zf:
+        sheets = read_sheets(zf)
+        if sheet_index < 0 or sheet_index >= len(sheets):
+            raise ShardError(f"invalid sheet index: {sheet_index}. Sheets available: {len(sheets)}")
+        title, part, _ = sheets[sheet_index]
+        wb_part = workbook_part(zf)
+        shared_strings = read_shared_strings(zf, wb_part)
+        number_formats = read_cell_number_formats(zf, wb_part)
+        epoch = CALENDAR_MAC_1904 if read_date1904(zf, wb_part) else WINDOWS_EPOCH
+        xml = zf.read(part)
+
+    parallel = workers > 1 and len(xml) >= MIN_PARALLEL_BYTES
+    shards = split_shards(xml, workers * SHARDS_PER_WORKER if parallel else 1)
+    del xml
+
+    if parallel and len(shards) > 1:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(shared_strings,),
+        ) as pool:
+            firsts = [index == 0 for index in range(len(shards))]
+            results = list(pool.map(parse_shard, shards, firsts))
+    else:
+        _init_worker(shared_strings)
+        results = [parse_shard(shard) for shard in shards]
+
+    # Date-formatted serials become datetimes against the data workbook's own
+    # epoch, as load_workbook does, so a 1904 workbook is not shifted by 4 years.
+    date_styles = {
+        index: is_timedelta_format(fmt)
+        for index, fmt in enumerate(number_formats)
+        if is_date_format(fmt)
+    }
+
+    cells = []
+    formulas = {}
+    for shard_cells, masters in results:
+        for si, row, col, formula in masters:
+            formulas[si] = (formula, f"{get_column_letter(col)}{row}")
+        for row, col, value, style in shard_cells:
+            if isinstance(value, tuple):
+                master = formulas.get(value[1])
+                value = None
+                if master is not None:
+                    formula, origin = master
+                    value = Translator(formula, origin).translate_formula(f"{get_column_letter(col)}{row}")
+            elif style in date_styles and type(value) in (int, float):
+                value = from_excel(value, epoch, timedelta=date_styles[style])
+            number_format = number_formats[style] if style < len(number_formats) else "General"
+            cells.append((row, col, value, number_format))
+    return ShardedSheet(title, cells)
@@ -0,0 +1,176 @@
+import posixpath
+import xml.etree.ElementTree as ET
+import zipfile
+
+from openpyxl.styles.numbers import BUILTIN_FORMATS
+from openpyxl.utils.cell import range_boundaries
+
+
+REL_OFFICE_DOCUMENT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+REL_STRICT_OFFICE_DOCUMENT = "http://purl.oclc.org/ooxml/officeDocument/relationships/officeDocument"
+
+
+def local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def find_children(element, name):
+    return [child for child in element if local_name(child.tag) == name]
+
+
+def find_child(element, name):
+    for child in element:
+        if local_name(child.tag) == name:
+            return child
+    return None
+
+
+def get_attr(element, name):
+    # Relationship ids are namespaced (r:id), plain attributes are not.
+    for key, value in element.attrib.items():
+        if local_name(key) == name:
+            return value
+    return None
+
+
+def resolve_target(base_part, target):
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(posixpath.dirname(base_part), target))
+
+
+def rels_path(part):
+    directory, name = posixpath.split(part)
+    return posixpath.join(directory, "_rels", f"{name}.rels")
+
+
+def read_relationships(zf, part):
+    try:
+        root = ET.fromstring(zf.read(rels_path(part)))
+    except KeyError:
+        return {}
+    return {
+        rel.get("Id"): (rel.get("Type"), resolve_target(part, rel.get("Target", "")))
+        for rel in find_children(root, "Relationship")
+        if rel.get("TargetMode") != "External"
+    }
+
+
+def workbook_part(zf):
+    for rel_type, target in read_relationships(zf, "").values():
+        if rel_type in (REL_OFFICE_DOCUMENT, REL_STRICT_OFFICE_DOCUMENT):
+            return target
+    return "xl/workbook.xml"
+
+
+def read_sheets(zf):
+    """Returns [(name, part_path, state)] for the worksheets of an open xlsx zip, in tab order."""
+    wb_part = workbook_part(zf)
+    root = ET.fromstring(zf.read(wb_part))
+    rels = read_relationships(zf, wb_part)
+    sheets_el = find_child(root, "sheets")
+    sheets = []
+    for sheet in find_children(sheets_el, "sheet") if sheets_el is not None else []:
+        rel = rels.get(get_attr(sheet, "id"))
+        if rel is None or not rel[0].endswith("/worksheet"):
+            continue
+        sheets.append((sheet.get("name"), rel[1], sheet.get("state", "visible")))
+    return sheets
+
+
+def read_date1904(zf, wb_part=None):
+    """True when the workbook uses the 1904 date system (<workbookPr date1904="1">)."""
+    root = ET.fromstring(zf.read(wb_part or workbook_part(zf)))
+    workbook_pr = find_child(root, "workbookPr")
+    return workbook_pr is not None and workbook_pr.get("date1904", "0").lower() in ("1", "true")
+
+
+def read_dimension(zf, part):
+    """Returns (max_row, max_col) from a worksheet's <dimension>, or None when it has none.
+
+    Only the start of the sheet XML is streamed; parsing stops at <sheetData>.
+    """
+    with zf.open(part) as fh:
+        for _, element in ET.iterparse(fh, events=("start",)):
+            name = local_name(element.tag)
+            if name == "dimension":
+                ref = element.get("ref")
+                if not ref:
+                    return None
+                _, _, max_col, max_row = range_boundaries(ref)
+                return max_row, max_col
+            if name == "sheetData":
+                return None
+    return None
+
+
+def inspect_workbook(path):
+    """Returns [(name, state, dimension)] for each worksheet without loading cell data."""
+    with zipfile.ZipFile(path) as zf:
+        return [
+            (name, state, read_dimension(zf, part) if part in zf.namelist() else None)
+            for name, part, state in read_sheets(zf)
+        ]
+
+
+def format_dimension(dimension):
+    if dimension is None:
+        return "unknown size"
+    return f"{dimension[0]} rows x {dimension[1]} cols"
+
+
+def string_item_text(element):
+    """Text of a shared or inline string item: plain <t> and rich-text runs <r><t>; phonetic <rPh> runs are skipped."""
+    parts = []
+    for child in element:
+        name = local_name(child.tag)
+        if name == "t":
+            parts.append(child.text or "")
+        elif name == "r":
+            text_el = find_child(child, "t")
+            if text_el is not None:
+                parts.append(text_el.text or "")
+    return "".join(parts)
+
+
+def read_shared_strings(zf, wb_part=None):
+    wb_part = wb_part or workbook_part(zf)
+    part = None
+    for rel_type, target in read_relationships(zf, wb_part).values():
+        if rel_type.endswith("/sharedStrings"):
+            part = target
+    if part is None or part not in zf.namelist():
+        return []
+
+    strings = []
+    with zf.open(part) as fh:
+        for _, element in ET.iterparse(fh):
+            if local_name(element.tag) != "si":
+                continue
+            strings.append(string_item_text(element))
+            element.clear()
+    return strings
+
+
+def read_cell_number_formats(zf, wb_part=None):
+    """Returns the number format string for each cellXfs style index."""
+    wb_part = wb_part or workbook_part(zf)
+    part = None
+    for rel_type, target in read_relationships(zf, wb_part).values():
+        if rel_type.endswith("/styles"):
+            part = target
+    if part is None or part not in zf.namelist():
+        return []
+
+    root = ET.fromstring(zf.read(part))
+    custom = {}
+    num_fmts = find_child(root, "numFmts")
+    for fmt in find_children(num_fmts, "numFmt") if num_fmts is not None else []:
+        custom[int(fmt.get("numFmtId"))] = fmt.get("formatCode", "General")
+
+    formats = []
+    cell_xfs = find_child(root, "cellXfs")
+    for xf in find_children(cell_xfs, "xf") if cell_xfs is not None else []:
+        fmt_id = int(xf.get("numFmtId", 0))
+        formats.append(custom.get(fmt_id) or BUILTIN_FORMATS.get(fmt_id, "General"))
+    return formats
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Tuple
+
+from data_gen import generate_rows
+from excel_export import export_to_xlsx
+
+
+DEFAULT_CATEGORIES = ["Sales", "Production", "Logistics"]
+DATE_FORMAT = "%Y-%m-%d"
+
+
+def parse_date(value: str) -> datetime:
+    try:
+        return datetime.strptime(value, DATE_FORMAT)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid date (expected YYYY-MM-DD): {value}") from exc
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    parser = argparse.ArgumentParser(
+        description="Generate raw .xlsx files without the GUI."
+    )
+    parser.add_argument(
+        "--files",
+        type=int,
+        default=1,
+        help="Number of files to generate (default: 1)",
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=50,
+        help="Rows per file (default: 50)",
+    )
+    parser.add_argument(
+        "--category",
+        action="append",
+        default=[],
+        help="Category to generate (can be repeated; files cycle through them). "
+        "Default: Sales, Production, Logistics",
+    )
+    parser.add_argument(
+        "--date-from",
+        type=parse_date,
+        default=today - timedelta(days=7),
+        help="Start date YYYY-MM-DD (default: 7 days ago)",
+    )
+    parser.add_argument(
+        "--date-to",
+        type=parse_date,
+        default=today,
+        help="End date YYYY-MM-DD (default: today)",
+    )
+    parser.add_argument(
+        "--split-dates",
+        action="store_true",
+        help="Give each file its own consecutive slice of the date range",
+    )
+    parser.add_argument(
+        "--min-amount",
+        type=float,
+        default=0.0,
+        help="Minimum amount (default: 0.0)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Base seed; file N uses seed + N - 1 (default: 0)",
+    )
+    parser.add_argument(
+        "--outdir",
+        default=str(Path(__file__).resolve().parent.parent / "out"),
+        help="Output directory (default: ../out)",
+    )
+    parser.add_argument(
+        "--prefix",
+        default="batch",
+        help="Output filename prefix (default: batch)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes (default: CPU count)",
+    )
+    return parser.parse_args(argv)
+
+
+def plan_date_ranges(
+    date_from: datetime, date_to: datetime, files: int, split: bool
+) -> List[Tuple[datetime, datetime]]:
+    start = date_from
+    end = date_to.replace(hour=23, minute=59, second=59)
+    if not split or files <= 1:
+        return [(start, end)] * files
+    step = (end - start) / files
+    ranges = []
+    for i in range(files):
+        slice_from = start + step * i
+        slice_to = end if i == files - 1 else start + step * (i + 1) - timedelta(seconds=1)
+        ranges.append((slice_from, max(slice_from, slice_to)))
+    return ranges
+
+
+def build_file_path(outdir: Path, prefix: str, index: int, category: str) -> Path:
+    name = f"{index:04d}_{category}_raw.xlsx"
+    if prefix:
+        name = f"{prefix}_{name}"
+    return outdir / name
+
+
+def generate_file(
+    path: str,
+    rows: int,
+    date_from: datetime,
+    date_to: datetime,
+    category: str,
+    min_amount: float,
+    seed: int,
+) -> str:
+    rng = random.Random(seed)
+    export_to_xlsx(path, generate_rows(rows, date_from, date_to, category, min_amount, rng))
+    return path
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+
+    if args.files <= 0 or args.rows <= 0:
+        print("Error: --files and --rows must be positive", file=sys.stderr)
+        return 2
+    if args.workers <= 0:
+        print("Error: --workers must be positive", file=sys.stderr)
+        return 2
+    if args.date_from > args.date_to:
+        print("Error: --date-from is after --date-to", file=sys.stderr)
+        return 2
+
+    categories = args.category or DEFAULT_CATEGORIES
+    outdir = Path(args.outdir)
+    try:
+        outdir.mkdir(parents=True, exist_ok=True)
+    except OSError as exc:
+        print(f"Error: failed to create output directory: {exc}", file=sys.stderr)
+        return 1
+
+    date_ranges = plan_date_ranges(args.date_from, args.date_to, args.files, args.split_dates)
+    jobs = []
+    for index in range(args.files):
+        category = categories[index % len(categories)]
+        date_from, date_to = date_ranges[index]
+        path = build_file_path(outdir, args.prefix, index + 1, category)
+        jobs.append(
+            (str(path), args.rows, date_from, date_to, category, args.min_amount, args.seed + index)
+        )
+
+    workers = min(args.workers, len(jobs))
+    try:
+        if workers == 1:
+            written = [generate_file(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(generate_file, *job) for job in jobs]
+                written = [future.result() for future in futures]
+    except Exception as exc:
+        print(f"Error: failed to generate files: {exc}", file=sys.stderr)
+        return 1
+
+    print("Summary:")
+    print(f"  Files: {len(written)}")
+    print(f"  Rows per file: {args.rows}")
+    print(f"  Categories: {', '.join(categories)}")
+    print(f"  Workers: {workers}")
+    print(f"  Output dir: {outdir}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -1,18 +1,21 @@
 import random
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 
 STATUSES = ["New", "Ok", "Hold"]
 
 
-def _random_datetime(start: datetime, end: datetime) -> datetime:
+def _random_datetime(
+    start: datetime, end: datetime, rng: Optional[random.Random] = None
+) -> datetime:
+    rng = rng or random
     if start > end:
         start, end = end, start
     delta = end - start
     if delta.total_seconds() <= 0:
         return start
-    offset = random.randint(0, int(delta.total_seconds()))
+    offset = rng.randint(0, int(delta.total_seconds()))
     return start + timedelta(seconds=offset)
 
 
@@ -22,11 +25,13 @@ def generate_rows(
     date_to: datetime,
     category: str,
     min_amount: float,
+    rng: Optional[random.Random] = None,
 ) -> List[Dict[str, str]]:
+    rng = rng or random
     rows = []
     for i in range(1, count + 1):
-        ts = _random_datetime(date_from, date_to)
-        amount = round(random.uniform(min_amount, min_amount + 1000.0), 2)
+        ts = _random_datetime(date_from, date_to, rng)
+        amount = round(rng.uniform(min_amount, min_amount + 1000.0), 2)
         rows.append(
             {
                 "Id": i,
@@ -34,7 +39,7 @@ def generate_rows(
                 "Category": category,
                 "Customer": f"Customer-{i:03d}",
                 "Amount": amount,
-                "Status": random.choice(STATUSES),
+                "Status": rng.choice(STATUSES),
             }
         )
     return rows
@@ -7,7 +7,7 @@ from openpyxl.utils import get_column_letter
 HEADERS = ["Id", "Timestamp", "Category", "Customer", "Amount", "Status"]
 
 
-def export_to_xlsx(path: str, rows: List[Dict[str, str]]) -> None:
+def build_workbook(rows: List[Dict[str, str]]) -> Workbook:
     wb = Workbook()
     ws = wb.active
     ws.title = "Data"
@@ -23,4 +23,8 @@ def export_to_xlsx(path: str, rows: List[Dict[str, str]]) -> None:
             max_len = max(max_len, len(str(value)))
         ws.column_dimensions[get_column_letter(col_idx)].width = min(max_len + 2, 40)
 
-    wb.save(path)
+    return wb
+
+
+def export_to_xlsx(path: str, rows: List[Dict[str, str]]) -> None:
+    build_workbook(rows).save(path)